@@ -24,6 +24,22 @@ public class LZWTool {
     // Path to the alphabet file for initializing the codebook
     private static String alphabetPath;
 
+    // Path to a batch manifest: run many compress/expand jobs in one JVM
+    private static String batchPath;
+
+    // Stay resident and read jobs from stdin (same format as a batch manifest)
+    private static boolean server = false;
+
+    // Set while running batch/server jobs so a bad job is reported instead of killing the JVM
+    private static boolean batchMode = false;
+
+    // Widest codewords a batch/server job may use. The codebook tables are allocated up front
+    // at 2^maxW entries, and an OutOfMemoryError would end every remaining job, not just one
+    private static final int MAX_JOB_WIDTH = 24;
+
+    // Alphabets already loaded by batch/server jobs, keyed by path (jobs usually share one file)
+    private static final HashMap<String, CachedAlphabet> alphabetCache = new HashMap<>();
+
     private static final boolean DEBUG = false; // Set to false to disable debug output
 
     // O(1) LRU tracking using doubly-linked list + HashMap for compression
@@ -388,6 +404,18 @@ public class LZWTool {
         if (DEBUG) System.err.println("[DEBUG] " + msg);
     }
 
+    // Thrown instead of exiting when a batch job hits bad input
+    private static class JobFailedException extends RuntimeException {
+        JobFailedException(String msg) { super(msg); }
+    }
+
+    // Fatal input error: exit normally, but only abort the current job in batch mode
+    private static void fail(String msg) {
+        if (batchMode) throw new JobFailedException(msg);
+        System.err.println(msg);
+        System.exit(1);
+    }
+
     private static String escapeString(String s) {
         if (s == null) return "null";
         return s.replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t");
@@ -460,6 +488,16 @@ public class LZWTool {
                     }
                     alphabetPath = args[++i];
                     break;
+                case "--batch":
+                    if (i + 1 >= args.length) {
+                        System.err.println("Missing value for argument: --batch requires a manifest file path");
+                        System.exit(1);
+                    }
+                    batchPath = args[++i];
+                    break;
+                case "--server":
+                    server = true;
+                    break;
                 default:
                     System.err.println("Unknown argument: '" + args[i] + "' is not a recognized option");
                     System.exit(2);
@@ -473,11 +511,23 @@ public class LZWTool {
             System.err.println("No arguments provided. Usage:");
             System.err.println("  Compress: java LZWTool --mode compress --alphabet <file> [--minW <n>] [--maxW <n>] [--policy <name>]");
             System.err.println("  Expand:   java LZWTool --mode expand");
+            System.err.println("  Batch:    java LZWTool --batch <manifest>");
+            System.err.println("  Server:   java LZWTool --server");
             System.exit(1);
         }
 
         parseArguments(args);
 
+        if (batchPath != null) {
+            runBatch(batchPath);
+            return;
+        }
+
+        if (server) {
+            runServer();
+            return;
+        }
+
         if (mode == null) {
             System.err.println("Missing required argument: --mode must be specified (compress or expand)");
             System.exit(1);
@@ -511,6 +561,182 @@ public class LZWTool {
         }
     }
 
+    /**
+     * Run every job in a manifest inside this JVM, so startup and JIT warmup
+     * are paid once instead of once per file.
+     *
+     * One job per line, fields separated by tabs so paths may contain spaces
+     * (blank lines and # comments skipped):
+     *   compress <in> <out> <minW> <maxW> <policy> <alphabet>
+     *   expand   <in> <out>
+     *
+     * Prints one status line per job to stdout: "OK <bytes written>" or "ERR: <message>".
+     * Exits with 1 if any job failed.
+     *
+     * @param manifestPath path to the manifest file
+     */
+    private static void runBatch(String manifestPath) {
+        int failures = 0;
+
+        try (BufferedReader reader = new BufferedReader(new FileReader(manifestPath))) {
+            failures = runJobs(reader);
+        } catch (IOException e) {
+            System.err.println("Failed to read batch manifest '" + manifestPath + "': " + e.getMessage());
+            System.exit(1);
+        }
+
+        if (failures > 0) System.exit(1);
+    }
+
+    /**
+     * Stay resident and run jobs read from stdin until EOF, so a test driver
+     * can reuse one warm JVM for every compress/expand call.
+     * Jobs and replies use the same format as --batch; each reply is flushed
+     * as soon as its job finishes.
+     */
+    private static void runServer() {
+        BufferedReader reader = new BufferedReader(new InputStreamReader(System.in));
+        try {
+            runJobs(reader);
+        } catch (IOException e) {
+            System.err.println("Failed to read job from stdin: " + e.getMessage());
+            System.exit(1);
+        }
+    }
+
+    /**
+     * Run each job line from reader and print its status line.
+     *
+     * @param reader source of job lines
+     * @return number of jobs that failed
+     */
+    private static int runJobs(BufferedReader reader) throws IOException {
+        batchMode = true;
+        int failures = 0;
+
+        String line;
+        while ((line = reader.readLine()) != null) {
+            String trimmed = line.trim();
+            if (trimmed.isEmpty() || trimmed.startsWith("#")) continue;
+
+            String status = runJob(line.split("\t"));
+            System.out.println(status);
+            System.out.flush();
+            if (status.startsWith("ERR")) failures++;
+        }
+
+        return failures;
+    }
+
+    // An alphabet file's symbols, with the file's mtime and length when it was read, so a
+    // server reloads an alphabet that was rewritten at the same path
+    private static class CachedAlphabet {
+        final long lastModified;
+        final long length;
+        final List<Character> symbols;
+
+        CachedAlphabet(long lastModified, long length, List<Character> symbols) {
+            this.lastModified = lastModified;
+            this.length = length;
+            this.symbols = symbols;
+        }
+
+        boolean isCurrent(File file) {
+            return file.lastModified() == lastModified && file.length() == length;
+        }
+    }
+
+    // Counts bytes written so a job can report its output size without a stat
+    private static class CountingOutputStream extends FilterOutputStream {
+        long count = 0;
+
+        CountingOutputStream(OutputStream out) { super(out); }
+
+        @Override
+        public void write(int b) throws IOException {
+            out.write(b);
+            count++;
+        }
+
+        @Override
+        public void write(byte[] b, int off, int len) throws IOException {
+            out.write(b, off, len);
+            count += len;
+        }
+    }
+
+    /**
+     * Run a single batch job with stdin/stdout pointed at its files.
+     *
+     * @param job manifest line split into its tab-separated fields
+     * @return status line: "OK <bytes written>" or "ERR: <message>"
+     */
+    private static String runJob(String[] job) {
+        InputStream stdin = System.in;
+        PrintStream stdout = System.out;
+        boolean finished = false;
+        CountingOutputStream output;
+
+        try {
+            if (job[0].equals("compress") && job.length == 7) {
+                int jobMinW = Integer.parseInt(job[3]);
+                int jobMaxW = Integer.parseInt(job[4]);
+                if (jobMinW < 1 || jobMaxW < jobMinW) {
+                    return "ERR: Invalid widths: minW=" + jobMinW + ", maxW=" + jobMaxW;
+                }
+                if (jobMaxW > MAX_JOB_WIDTH) {
+                    return "ERR: Invalid widths: maxW=" + jobMaxW + " (batch jobs allow at most " + MAX_JOB_WIDTH + ")";
+                }
+
+                File alphabetFile = new File(job[6]);
+                CachedAlphabet cached = alphabetCache.get(job[6]);
+                List<Character> alphabet;
+                if (cached != null && cached.isCurrent(alphabetFile)) {
+                    alphabet = cached.symbols;
+                } else {
+                    // Stat before reading, so a write during the load leaves the entry stale
+                    long lastModified = alphabetFile.lastModified();
+                    long length = alphabetFile.length();
+                    alphabet = loadAlphabet(job[6]);
+                    if (alphabet == null || alphabet.size() == 0) {
+                        return "ERR: Failed to load alphabet: '" + job[6] + "'";
+                    }
+                    alphabetCache.put(job[6], new CachedAlphabet(lastModified, length, alphabet));
+                }
+
+                System.setIn(new FileInputStream(job[1]));
+                output = new CountingOutputStream(new FileOutputStream(job[2]));
+                System.setOut(new PrintStream(output));
+                compress(jobMinW, jobMaxW, job[5], alphabet);
+            } else if (job[0].equals("expand") && job.length == 3) {
+                System.setIn(new FileInputStream(job[1]));
+                output = new CountingOutputStream(new FileOutputStream(job[2]));
+                System.setOut(new PrintStream(output));
+                expand();
+            } else {
+                return "ERR: Malformed job: '" + String.join(" ", job) + "'";
+            }
+
+            finished = true;
+            return "OK " + output.count;
+        } catch (NumberFormatException e) {
+            return "ERR: Invalid width: " + e.getMessage();
+        } catch (IOException e) {
+            return "ERR: " + e.getMessage();
+        } catch (JobFailedException e) {
+            return "ERR: " + e.getMessage();
+        } catch (RuntimeException e) {
+            // e.g. NoSuchElementException from BinaryStdIn on truncated input
+            return "ERR: " + e.toString();
+        } finally {
+            // Release the job's streams so the next job re-initializes BinaryStdIn/Out
+            if (System.in != stdin) BinaryStdIn.close();
+            if (!finished && System.out != stdout) BinaryStdOut.close();
+            System.setIn(stdin);
+            System.setOut(stdout);
+        }
+    }
+
     private static List<Character> loadAlphabet(String path) {
 
         // Pre-allocate with max extended ASCII size
@@ -650,8 +876,7 @@ public class LZWTool {
 
         char c = BinaryStdIn.readChar();
         if (!validChar[c]) {
-            System.err.println("Input contains byte value " + (int) c + " which is not in the alphabet");
-            System.exit(1);
+            fail("Input contains byte value " + (int) c + " which is not in the alphabet");
         }
         StringBuilder current = new StringBuilder().append(c);
         debug("\nFirst character: '" + escapeString(String.valueOf(c)) + "'");
@@ -669,8 +894,7 @@ public class LZWTool {
 
             c = BinaryStdIn.readChar();
             if (!validChar[c]) {
-                System.err.println("Input contains byte value " + (int) c + " which is not in the alphabet");
-                System.exit(1);
+                fail("Input contains byte value " + (int) c + " which is not in the alphabet");
             }
 
             // Reuse nextBuilder instead of creating new StringBuilder
@@ -851,6 +1075,11 @@ public class LZWTool {
 
         Header h = readHeader();
 
+        // A corrupt header can claim any width; check it before sizing the tables from it
+        if (batchMode && (h.minW < 1 || h.maxW < h.minW || h.maxW > MAX_JOB_WIDTH)) {
+            fail("Corrupt header: invalid widths minW=" + h.minW + ", maxW=" + h.maxW);
+        }
+
         int maxCode = 1 << h.maxW;
         int W = h.minW;
         int alphabetSize = h.alphabetSize;
@@ -916,8 +1145,7 @@ public class LZWTool {
             debug("OUTPUT: '" + escapeString(val) + "'");
             BinaryStdOut.write(val);
         } else {
-            System.err.println("Bad compressed code: " + prevCode);
-            System.exit(1);
+            fail("Bad compressed code: " + prevCode);
         }
 
         String valPrior = dictionary[prevCode];
@@ -981,8 +1209,7 @@ public class LZWTool {
                 s = valPrior + valPrior.charAt(0);
                 debug("Codeword " + codeword + " not in table (special case): '" + escapeString(s) + "'");
             } else {
-                System.err.println("Bad compressed code: " + codeword);
-                System.exit(1);
+                fail("Bad compressed code: " + codeword);
                 return; // unreachable but keeps compiler happy
             }
 
@@ -0,0 +1,140 @@
+#!/bin/bash
+
+# Shared helpers for the LZWTool test scripts.
+# Source this file from the repo root: source "$(dirname "$0")/lzw_common.sh"
+
+JAVA_SOURCES=(LZWTool.java BinaryStdIn.java BinaryStdOut.java TSTmod.java)
+
+# Class files go to their own directory, kept apart from the sources; every
+# java/javac call below (and in the scripts) picks it up through CLASSPATH
+LZW_CLASSES="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/classes"
+export CLASSPATH="$LZW_CLASSES"
+
+# Compile once per script, and only if a source is newer than its class file
+# (-nt is also true when the class file is missing, so no separate -f probe)
+_compiled=false
+ensure_compiled() {
+    if $_compiled; then
+        return 0
+    fi
+
+    local src class
+    for src in "${JAVA_SOURCES[@]}"; do
+        class="$LZW_CLASSES/${src%.java}.class"
+        if [ "$src" -nt "$class" ]; then
+            mkdir -p "$LZW_CLASSES"
+            javac -Xprefer:source -d "$LZW_CLASSES" "${JAVA_SOURCES[@]}" || return 1
+            break
+        fi
+    done
+
+    _compiled=true
+}
+
+# Worker limit for scripts that run tests concurrently (one per core)
+MAX_JOBS=$(nproc 2>/dev/null || sysctl -n hw.ncpu 2>/dev/null || echo 4)
+
+# Block until a worker slot is free
+throttle() {
+    while [ "$(jobs -rp | wc -l)" -ge "$MAX_JOBS" ]; do
+        wait -n 2>/dev/null || sleep 0.1
+    done
+}
+
+# Start one long-running LZWTool (--server) for the calling shell, so every
+# compress/expand reuses a warm JVM instead of spawning a new one.
+# Talks over FIFOs in the given directory: jobs on fd 7, replies on fd 8.
+# The server is the one place that makes sure the classes are current;
+# lzw_server_run/lzw_roundtrip callers never check again.
+lzw_server_start() {
+    local fifo_dir="$1"
+
+    ensure_compiled || return 1
+    mkfifo "$fifo_dir/jobs" "$fifo_dir/replies"
+    java LZWTool --server < "$fifo_dir/jobs" > "$fifo_dir/replies" 2>/dev/null &
+    LZW_SERVER_PID=$!
+
+    exec 7> "$fifo_dir/jobs" 8< "$fifo_dir/replies"
+}
+
+# Run one job (same fields as a --batch manifest line, one per argument). The
+# reply, "OK <bytes written>" or "ERR: <message>", is left in LZW_REPLY instead
+# of being printed, so callers don't fork a $(...) subshell per job.
+# If LZW_PROFILE names a file, "<microseconds> <mode>" is appended to it for
+# every job, measured from sending the job to getting its reply.
+lzw_server_run() {
+    local start=${EPOCHREALTIME/[.,]/}
+    local field IFS=$'\t'
+
+    # Fields are tab-separated, so spaces in paths are fine but tabs and
+    # newlines can't be sent
+    for field in "$@"; do
+        if [[ "$field" == *[$'\t\n']* ]]; then
+            LZW_REPLY="ERR: job field contains a tab or newline: '$field'"
+            return 1
+        fi
+    done
+
+    # A dead server should surface as an ERR reply, not kill the caller.
+    # SIGPIPE is ignored for this write only: ignoring it shell-wide would be
+    # inherited by children, so pipelines like "diff | head" would see EPIPE
+    # errors instead of exiting quietly.
+    trap '' PIPE
+    echo "$*" >&7 2>/dev/null
+    trap - PIPE
+
+    if ! read -r LZW_REPLY <&8; then
+        LZW_REPLY="ERR: server exited"
+    fi
+
+    if [ -n "$LZW_PROFILE" ]; then
+        echo "$(( ${EPOCHREALTIME/[.,]/} - start )) $1" >> "$LZW_PROFILE"
+    fi
+}
+
+lzw_server_stop() {
+    exec 7>&- 8<&-
+    wait "$LZW_SERVER_PID" 2>/dev/null
+}
+
+# Compress input_file and expand it back on the running server, then check
+# the result. Writes <out_prefix>.lzw and <out_prefix>.out. Sets LZW_REPLY to:
+#   OK <compressed bytes>
+#   ERR: compress: <message>
+#   ERR: expand: <message>
+#   ERR: output does not match input
+lzw_roundtrip() {
+    local input_file="$1"
+    local alphabet="$2"
+    local minW=$3
+    local maxW=$4
+    local policy="$5"
+    local out_prefix="$6"
+    local compressed_size
+
+    lzw_server_run compress "$input_file" "$out_prefix.lzw" "$minW" "$maxW" "$policy" "$alphabet"
+    if [ "${LZW_REPLY%% *}" != "OK" ]; then
+        LZW_REPLY="ERR: compress: ${LZW_REPLY#ERR: }"
+        return 1
+    fi
+    compressed_size="${LZW_REPLY#OK }"
+
+    lzw_server_run expand "$out_prefix.lzw" "$out_prefix.out"
+    if [ "${LZW_REPLY%% *}" != "OK" ]; then
+        LZW_REPLY="ERR: expand: ${LZW_REPLY#ERR: }"
+        return 1
+    fi
+
+    if ! cmp -s "$input_file" "$out_prefix.out"; then
+        LZW_REPLY="ERR: output does not match input"
+        return 1
+    fi
+
+    LZW_REPLY="OK $compressed_size"
+}
+
+# Print N pseudo-random bytes from a fixed seed (default 42), so "random"
+# inputs are identical on every run and in every parallel worker
+seeded_random_bytes() {
+    python3 -c "import random, sys; n = int(sys.argv[1]); sys.stdout.buffer.write(random.Random(int(sys.argv[2])).getrandbits(8 * n).to_bytes(n, 'little'))" "$1" "${2:-42}"
+}
@@ -0,0 +1,139 @@
+#!/bin/bash
+
+# Run every test script concurrently and report pass/fail per script.
+# Usage: ./run_tests.sh [--fast] [--profile] [script ...]   (default: all test_*.sh and verify_*.sh)
+#   --fast     stop the remaining scripts as soon as one fails
+#   --profile  report each script's wall time against the time its LZWTool
+#              server jobs took, to show where the time actually goes
+
+cd "$(dirname "$0")"
+source ./lzw_common.sh
+
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+BLUE='\033[0;34m'
+NC='\033[0m'
+
+# Compile up front so the scripts don't race each other to javac
+echo -e "${BLUE}Compiling...${NC}"
+if ! ensure_compiled; then
+    echo -e "${RED}Compilation failed!${NC}"
+    exit 1
+fi
+
+FAST=false
+PROFILE=false
+while [ $# -gt 0 ]; do
+    case "$1" in
+        --fast) FAST=true ;;
+        --profile) PROFILE=true ;;
+        *) break ;;
+    esac
+    shift
+done
+
+# Timing uses EPOCHREALTIME, which only exists from bash 5 on
+if $PROFILE && [ -z "$EPOCHREALTIME" ]; then
+    echo -e "${RED}--profile needs bash 5 or later${NC}"
+    exit 1
+fi
+
+if [ $# -gt 0 ]; then
+    SCRIPTS=("$@")
+else
+    SCRIPTS=(test_*.sh verify_*.sh)
+fi
+
+LOG_DIR=$(mktemp -d)
+trap 'rm -rf "$LOG_DIR"' EXIT
+
+# Give each script its own process group, so --fast can stop it along
+# with any JVMs it started
+set -m
+
+# Stop every script that is still running, JVMs included
+stop_scripts() {
+    local pid
+    for pid in "${pids[@]}"; do
+        kill -- -"$pid" 2>/dev/null
+    done
+}
+
+# Ctrl-C only reaches this shell, not the scripts' process groups, so pass
+# it on and wait for them before the EXIT trap removes their log directory
+trap 'stop_scripts; wait; exit 130' INT
+trap 'stop_scripts; wait; exit 143' TERM
+
+echo -e "${BLUE}Running ${#SCRIPTS[@]} test scripts in parallel...${NC}\n"
+pids=()
+for script in "${SCRIPTS[@]}"; do
+    name=$(basename "$script")
+    (
+        if $PROFILE; then
+            start=${EPOCHREALTIME/[.,]/}
+            export LZW_PROFILE="$LOG_DIR/$name.jobs"
+            : > "$LZW_PROFILE"
+        fi
+        bash "$script" > "$LOG_DIR/$name.log" 2>&1
+        echo $? > "$LOG_DIR/$name.status"
+        if $PROFILE; then
+            echo $(( ${EPOCHREALTIME/[.,]/} - start )) > "$LOG_DIR/$name.time"
+        fi
+    ) &
+    pids+=($!)
+done
+set +m
+
+if $FAST; then
+    # Stop everything once any script has failed - the overall result is known
+    while [ -n "$(jobs -rp)" ]; do
+        wait -n 2>/dev/null || sleep 0.1
+        if grep -qvx 0 "$LOG_DIR"/*.status 2>/dev/null; then
+            stop_scripts
+            break
+        fi
+    done
+fi
+wait
+
+# Report in the order given; show the tail of each failing script's log
+failed=0
+for script in "${SCRIPTS[@]}"; do
+    name=$(basename "$script")
+    if [ ! -f "$LOG_DIR/$name.status" ]; then
+        echo -e "${BLUE}⊘ $name (stopped)${NC}"
+    elif [ "$(<"$LOG_DIR/$name.status")" = "0" ]; then
+        echo -e "${GREEN}✓ $name${NC}"
+    else
+        echo -e "${RED}✗ $name${NC}"
+        tail -20 "$LOG_DIR/$name.log" | sed 's/^/    /'
+        failed=$((failed + 1))
+    fi
+done
+
+if $PROFILE; then
+    # Job times are summed across a script's parallel workers, so they can
+    # add up to more than its wall time
+    echo -e "\n${BLUE}Profile:${NC}"
+    for script in "${SCRIPTS[@]}"; do
+        name=$(basename "$script")
+        if [ ! -f "$LOG_DIR/$name.time" ]; then
+            continue
+        fi
+        awk -v name="$name" -v wall="$(<"$LOG_DIR/$name.time")" '
+            { total += $1; count[$2]++ }
+            END {
+                printf "  %-36s %7.2fs wall, %4d compress + %4d expand jobs in %7.2fs\n",
+                    name, wall / 1e6, count["compress"], count["expand"], total / 1e6
+            }' "$LOG_DIR/$name.jobs"
+    done
+fi
+
+echo ""
+if [ $failed -eq 0 ]; then
+    echo -e "${GREEN}All ${#SCRIPTS[@]} test scripts passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}$failed of ${#SCRIPTS[@]} test scripts failed!${NC}"
+    exit 1
+fi
@@ -1,25 +1,30 @@
 #!/bin/bash
 
+source "$(dirname "$0")/lzw_common.sh"
+
 echo "========================================="
 echo "Testing LRU with 'ab' * 50"
 echo "minW=3, maxW=4"
 echo "========================================="
 
+WORK_DIR=$(mktemp -d)
+trap 'rm -rf "$WORK_DIR"' EXIT
+
 # Create alphabet file with just 'a' and 'b'
 echo "Creating alphabet file..."
-echo -e "a\nb" > test_alphabet.txt
+echo -e "a\nb" > "$WORK_DIR/test_alphabet.txt"
 
 # Create test input: "ab" repeated 50 times
 echo "Creating test input: 'ab' * 50..."
-python3 -c "print('ab' * 50, end='')" > test_input.txt
+python3 -c "import sys; sys.stdout.buffer.write(b'ab' * 50)" > "$WORK_DIR/test_input.txt"
 
-echo "Test input length: $(wc -c < test_input.txt) bytes"
-echo "Test input content: $(cat test_input.txt)"
+echo "Test input length: $(wc -c < "$WORK_DIR/test_input.txt") bytes"
+echo "Test input content: $(<"$WORK_DIR/test_input.txt")"
 echo ""
 
-# Compile Java files
+# Compile Java files (skipped if the class files are up to date)
 echo "Compiling Java files..."
-javac LZWTool.java BinaryStdIn.java BinaryStdOut.java TSTmod.java
+ensure_compiled
 if [ $? -ne 0 ]; then
     echo "Compilation failed!"
     exit 1
@@ -31,31 +36,31 @@ echo ""
 echo "========================================="
 echo "Running COMPRESSION with LRU policy..."
 echo "========================================="
-java LZWTool --mode compress --minW 3 --maxW 4 --policy lru --alphabet test_alphabet.txt < test_input.txt > test_compressed.lzw 2> compress_debug.log
+java LZWTool --mode compress --minW 3 --maxW 4 --policy lru --alphabet "$WORK_DIR/test_alphabet.txt" < "$WORK_DIR/test_input.txt" > "$WORK_DIR/test_compressed.lzw" 2> "$WORK_DIR/compress_debug.log"
 if [ $? -ne 0 ]; then
     echo "Compression failed!"
-    cat compress_debug.log
+    cat "$WORK_DIR/compress_debug.log"
     exit 1
 fi
 echo "Compression complete!"
-echo "Compressed size: $(wc -c < test_compressed.lzw) bytes"
+echo "Compressed size: $(wc -c < "$WORK_DIR/test_compressed.lzw") bytes"
 echo ""
 
 # Show compression debug output
 echo "========================================="
 echo "COMPRESSION DEBUG OUTPUT:"
 echo "========================================="
-cat compress_debug.log
+cat "$WORK_DIR/compress_debug.log"
 echo ""
 
 # Expand
 echo "========================================="
 echo "Running EXPANSION..."
 echo "========================================="
-java LZWTool --mode expand < test_compressed.lzw > test_output.txt 2> expand_debug.log
+java LZWTool --mode expand < "$WORK_DIR/test_compressed.lzw" > "$WORK_DIR/test_output.txt" 2> "$WORK_DIR/expand_debug.log"
 if [ $? -ne 0 ]; then
     echo "Expansion failed!"
-    cat expand_debug.log
+    cat "$WORK_DIR/expand_debug.log"
     exit 1
 fi
 echo "Expansion complete!"
@@ -65,24 +70,24 @@ echo ""
 echo "========================================="
 echo "EXPANSION DEBUG OUTPUT:"
 echo "========================================="
-cat expand_debug.log
+cat "$WORK_DIR/expand_debug.log"
 echo ""
 
 # Compare results
 echo "========================================="
 echo "VERIFICATION:"
 echo "========================================="
-echo "Original input:  $(cat test_input.txt)"
-echo "Decompressed:    $(cat test_output.txt)"
+echo "Original input:  $(<"$WORK_DIR/test_input.txt")"
+echo "Decompressed:    $(<"$WORK_DIR/test_output.txt")"
 echo ""
 
-if diff -q test_input.txt test_output.txt > /dev/null; then
+if diff -q "$WORK_DIR/test_input.txt" "$WORK_DIR/test_output.txt" > /dev/null; then
     echo "✓ SUCCESS! Input and output match perfectly!"
     exit 0
 else
     echo "✗ FAILURE! Input and output do NOT match!"
     echo ""
     echo "Differences:"
-    diff test_input.txt test_output.txt
+    diff "$WORK_DIR/test_input.txt" "$WORK_DIR/test_output.txt"
     exit 1
 fi
@@ -1,14 +1,68 @@
 #!/bin/bash
 
+source "$(dirname "$0")/lzw_common.sh"
+
 echo "==================================================================="
 echo "COMPREHENSIVE TEST: Cached Bit-Shift Doesn't Break Anything"
 echo "==================================================================="
 echo ""
 
+if ! ensure_compiled; then
+    echo "Compilation failed!"
+    exit 1
+fi
+
 # Test with multiple files, alphabets, and bit widths
 test_count=0
 pass_count=0
 
+# Tests are grouped by alphabet, and each group runs in one worker that
+# keeps a single LZWTool --server JVM for all of its tests, so startup is
+# paid once per alphabet instead of twice per test. Groups run concurrently.
+# Each test gets its own directory so parallel runs never share files.
+RESULTS_DIR=$(mktemp -d)
+trap 'rm -rf "$RESULTS_DIR"' EXIT
+pending=()
+groups=()
+
+report() {
+    local task_dir="$1"
+    local input_file="$2"
+    local desc="$3"
+    local reply="$4"
+
+    case "$reply" in
+        OK*)
+            echo "  ✓ $desc"
+            touch "$task_dir/pass"
+            ;;
+        "ERR: compress: "*)
+            echo "  ✗ Compression failed"
+            ;;
+        "ERR: expand: "*)
+            echo "  ✗ Decompression failed"
+            ;;
+        *)
+            echo "  ✗ $desc - OUTPUT DOESN'T MATCH!"
+            echo "    This would indicate cached bit-shift BROKE something!"
+            diff "$input_file" "$task_dir/test.out" | head -10
+            ;;
+    esac
+}
+
+# Run one alphabet's tests through a single server JVM
+run_group() {
+    local group_dir="$1"
+    local task_dir input_file desc alphabet minW maxW policy
+
+    lzw_server_start "$group_dir"
+    while IFS=$'\t' read -r task_dir input_file desc alphabet minW maxW policy; do
+        lzw_roundtrip "$input_file" "$alphabet" $minW $maxW "$policy" "$task_dir/test"
+        report "$task_dir" "$input_file" "$desc" "$LZW_REPLY" > "$task_dir/log"
+    done < "$group_dir/tasks"
+    lzw_server_stop
+}
+
 run_test() {
     local desc="$1"
     local alphabet="$2"
@@ -18,60 +72,73 @@ run_test() {
     local input_file="$6"
 
     test_count=$((test_count + 1))
-
-    # Compress
-    cat "$input_file" | java LZWTool --mode compress --alphabet "$alphabet" \
-        --minW $minW --maxW $maxW --policy "$policy" > /tmp/test.lzw 2>/dev/null
-
-    if [ $? -ne 0 ]; then
-        echo "  ✗ Compression failed"
-        return
+    local task_dir="$RESULTS_DIR/$test_count"
+    mkdir "$task_dir"
+    pending+=("$task_dir")
+
+    local group_dir="$RESULTS_DIR/group_$(basename "$alphabet" .txt)"
+    # mkdir fails if the group already exists; no need to test for it first
+    if mkdir "$group_dir" 2>/dev/null; then
+        groups+=("$group_dir")
     fi
+    printf '%s\t%s\t%s\t%s\t%s\t%s\t%s\n' "$task_dir" "$input_file" "$desc" "$alphabet" $minW $maxW "$policy" >> "$group_dir/tasks"
+}
 
-    # Decompress
-    cat /tmp/test.lzw | java LZWTool --mode expand > /tmp/test.out 2>/dev/null
-
-    if [ $? -ne 0 ]; then
-        echo "  ✗ Decompression failed"
-        return
-    fi
+# Queue a line of report text so it prints in order with the test results
+note_count=0
+note() {
+    note_count=$((note_count + 1))
+    local note_dir="$RESULTS_DIR/note$note_count"
+    mkdir "$note_dir"
+    echo "$1" > "$note_dir/log"
+    pending+=("$note_dir")
+}
 
-    # Verify
-    if cmp -s "$input_file" /tmp/test.out; then
-        echo "  ✓ $desc"
-        pass_count=$((pass_count + 1))
-    else
-        echo "  ✗ $desc - OUTPUT DOESN'T MATCH!"
-        echo "    This would indicate cached bit-shift BROKE something!"
-        diff "$input_file" /tmp/test.out | head -10
-    fi
+# Run the queued groups and report tests in submission order
+collect_results() {
+    local group_dir task_dir
+    for group_dir in "${groups[@]}"; do
+        throttle
+        run_group "$group_dir" &
+    done
+    wait
+    groups=()
+
+    for task_dir in "${pending[@]}"; do
+        cat "$task_dir/log"
+        if [ -f "$task_dir/pass" ]; then
+            pass_count=$((pass_count + 1))
+        fi
+    done
+    pending=()
 }
 
-echo "Test 1: Different bit widths with ab.txt"
-echo "  Testing minW from 2-10, maxW from 4-16..."
+note "Test 1: Different bit widths with ab.txt"
+note "  Testing minW from 2-10, maxW from 4-16..."
 
+# Inputs are written once and shared by every test that uses them
+echo "aaabbbaaabbbaaabbbaaabbb" > "$RESULTS_DIR/ab_pattern.txt"
 for minW in 2 3 4 5; do
     for maxW in $((minW+2)) $((minW+5)) 16; do
-        echo "aaabbbaaabbbaaabbbaaabbb" > /tmp/input.txt
-        run_test "minW=$minW maxW=$maxW freeze" "alphabets/ab.txt" $minW $maxW "freeze" "/tmp/input.txt"
+        run_test "minW=$minW maxW=$maxW freeze" "alphabets/ab.txt" $minW $maxW "freeze" "$RESULTS_DIR/ab_pattern.txt"
     done
 done
 
-echo ""
-echo "Test 2: All policies with different bit widths"
+note ""
+note "Test 2: All policies with different bit widths"
 
+echo "AAAAABBBBBCCCCCDDDDDRRRR" > "$RESULTS_DIR/abracadabra_pattern.txt"
 for policy in freeze reset lru lfu; do
-    echo "AAAAABBBBBCCCCCDDDDDRRRR" > /tmp/input.txt
-    run_test "abracadabra $policy minW=3 maxW=8" "alphabets/abracadabra.txt" 3 8 "$policy" "/tmp/input.txt"
-    run_test "abracadabra $policy minW=4 maxW=12" "alphabets/abracadabra.txt" 4 12 "$policy" "/tmp/input.txt"
+    run_test "abracadabra $policy minW=3 maxW=8" "alphabets/abracadabra.txt" 3 8 "$policy" "$RESULTS_DIR/abracadabra_pattern.txt"
+    run_test "abracadabra $policy minW=4 maxW=12" "alphabets/abracadabra.txt" 4 12 "$policy" "$RESULTS_DIR/abracadabra_pattern.txt"
 done
 
-echo ""
-echo "Test 3: Real files with ASCII (large codebooks - lots of W increases)"
+note ""
+note "Test 3: Real files with ASCII (large codebooks - lots of W increases)"
 
+# minW=9 maxW=16 is left to test_real_files.sh, which runs it for every policy
 if [ -f "TestFiles/code.txt" ]; then
     run_test "code.txt minW=9 maxW=12" "alphabets/ascii.txt" 9 12 "freeze" "TestFiles/code.txt"
-    run_test "code.txt minW=9 maxW=16" "alphabets/ascii.txt" 9 16 "lru" "TestFiles/code.txt"
     run_test "code.txt minW=8 maxW=20" "alphabets/ascii.txt" 8 20 "lfu" "TestFiles/code.txt"
 fi
 
@@ -79,31 +146,34 @@ if [ -f "TestFiles/medium.txt" ]; then
     run_test "medium.txt minW=7 maxW=14" "alphabets/ascii.txt" 7 14 "reset" "TestFiles/medium.txt"
 fi
 
-echo ""
-echo "Test 4: Edge cases - very small and very large maxW"
+note ""
+note "Test 4: Edge cases - very small and very large maxW"
 
-echo "ab" > /tmp/tiny.txt
-run_test "Tiny file minW=2 maxW=4" "alphabets/ab.txt" 2 4 "freeze" "/tmp/tiny.txt"
-run_test "Tiny file minW=2 maxW=20" "alphabets/ab.txt" 2 20 "freeze" "/tmp/tiny.txt"
+echo "ab" > "$RESULTS_DIR/tiny.txt"
+run_test "Tiny file minW=2 maxW=4" "alphabets/ab.txt" 2 4 "freeze" "$RESULTS_DIR/tiny.txt"
+run_test "Tiny file minW=2 maxW=20" "alphabets/ab.txt" 2 20 "freeze" "$RESULTS_DIR/tiny.txt"
 
 # Generate long file
-head -c 10000 /dev/zero | tr '\0' 'a' > /tmp/long.txt
-run_test "Long file (10KB) minW=3 maxW=16" "alphabets/ab.txt" 3 16 "reset" "/tmp/long.txt"
+head -c 10000 /dev/zero | tr '\0' 'a' > "$RESULTS_DIR/long.txt"
+run_test "Long file (10KB) minW=3 maxW=16" "alphabets/ab.txt" 3 16 "reset" "$RESULTS_DIR/long.txt"
 
-echo ""
-echo "Test 5: Bit-width crosses multiple thresholds"
-echo "  This tests that W increases correctly at: 8, 16, 32, 64, 128, 256, 512, 1024..."
+note ""
+note "Test 5: Bit-width crosses multiple thresholds"
+note "  This tests that W increases correctly at: 8, 16, 32, 64, 128, 256, 512, 1024..."
 
 # Create input that will force many W increases
-python3 <<'PYTHON'
-with open('/tmp/varied.txt', 'w') as f:
-    # Create patterns that will grow the codebook
-    for i in range(1000):
-        f.write('a' * (i % 10) + 'b' * (i % 7))
+python3 - "$RESULTS_DIR/varied.txt" <<'PYTHON'
+import sys
+
+# Create patterns that will grow the codebook (built as bytes in one join, written once)
+with open(sys.argv[1], 'wb') as f:
+    f.write(b''.join(b'a' * (i % 10) + b'b' * (i % 7) for i in range(1000)))
 PYTHON
 
-run_test "Varied patterns minW=3 maxW=12" "alphabets/ab.txt" 3 12 "freeze" "/tmp/varied.txt"
-run_test "Varied patterns minW=2 maxW=16" "alphabets/ab.txt" 2 16 "lru" "/tmp/varied.txt"
+run_test "Varied patterns minW=3 maxW=12" "alphabets/ab.txt" 3 12 "freeze" "$RESULTS_DIR/varied.txt"
+run_test "Varied patterns minW=2 maxW=16" "alphabets/ab.txt" 2 16 "lru" "$RESULTS_DIR/varied.txt"
+
+collect_results
 
 echo ""
 echo "==================================================================="
@@ -132,6 +202,3 @@ else
     echo "This would indicate the cached bit-shift optimization has a BUG!"
     exit 1
 fi
-
-# Cleanup
-rm -f /tmp/test.lzw /tmp/test.out /tmp/input.txt /tmp/tiny.txt /tmp/long.txt /tmp/varied.txt
@@ -2,6 +2,8 @@
 
 # Test all possible edge cases and bad inputs
 
+source "$(dirname "$0")/lzw_common.sh"
+
 GREEN='\033[0;32m'
 RED='\033[0;31m'
 BLUE='\033[0;34m'
@@ -11,6 +13,14 @@ echo -e "${BLUE}=====================================${NC}"
 echo -e "${BLUE}Testing Edge Cases & Bad Inputs${NC}"
 echo -e "${BLUE}=====================================${NC}\n"
 
+if ! ensure_compiled; then
+    echo -e "${RED}Compilation failed!${NC}"
+    exit 1
+fi
+
+WORK_DIR=$(mktemp -d)
+trap 'rm -rf "$WORK_DIR"' EXIT
+
 test_count=0
 pass_count=0
 
@@ -23,13 +33,14 @@ run_test() {
     test_count=$((test_count + 1))
     echo -e "${BLUE}Test $test_count: $test_name${NC}"
 
-    eval "$cmd" > /tmp/test_out.txt 2>&1
+    # Keep stderr in memory for the report; stdout isn't needed
+    output=$(eval "$cmd" 2>&1 >/dev/null)
     result=$?
 
     if [ "$expected_result" = "fail" ]; then
         if [ $result -ne 0 ]; then
             echo -e "${GREEN}✓ Correctly failed${NC}"
-            echo "  Error: $(head -1 /tmp/test_out.txt)"
+            echo "  Error: ${output%%$'\n'*}"
             pass_count=$((pass_count + 1))
         else
             echo -e "${RED}✗ Should have failed but didn't${NC}"
@@ -40,7 +51,7 @@ run_test() {
             pass_count=$((pass_count + 1))
         else
             echo -e "${RED}✗ Should have passed but failed${NC}"
-            echo "  Error: $(head -1 /tmp/test_out.txt)"
+            echo "  Error: ${output%%$'\n'*}"
         fi
     fi
     echo ""
@@ -74,28 +85,28 @@ run_test "Non-existent alphabet file" "fail" \
     "echo 'a' | java LZWTool --mode compress --alphabet /nonexistent/file.txt --minW 3 --maxW 4"
 
 run_test "Empty alphabet file" "fail" \
-    "touch /tmp/empty_alphabet.txt && echo 'a' | java LZWTool --mode compress --alphabet /tmp/empty_alphabet.txt --minW 3 --maxW 4"
+    "touch '$WORK_DIR/empty_alphabet.txt' && echo 'a' | java LZWTool --mode compress --alphabet '$WORK_DIR/empty_alphabet.txt' --minW 3 --maxW 4"
 
 # 4. Alphabet validation
 run_test "Character not in alphabet (char 'c' not in ab.txt)" "fail" \
     "echo 'abc' | java LZWTool --mode compress --alphabet alphabets/ab.txt --minW 3 --maxW 4"
 
 run_test "Binary data with text alphabet" "fail" \
-    "head -c 100 /dev/urandom | java LZWTool --mode compress --alphabet alphabets/ab.txt --minW 3 --maxW 4"
+    "seeded_random_bytes 100 | java LZWTool --mode compress --alphabet alphabets/ab.txt --minW 3 --maxW 4"
 
 run_test "JPEG with binary alphabet (ab.txt)" "fail" \
     "cat TestFiles/frosty.jpg | java LZWTool --mode compress --alphabet alphabets/ab.txt --minW 3 --maxW 4"
 
 # 5. Empty/minimal inputs
 run_test "Empty input (compress)" "pass" \
-    "echo -n '' | java LZWTool --mode compress --alphabet alphabets/ab.txt --minW 3 --maxW 4 > /tmp/empty.lzw"
+    "echo -n '' | java LZWTool --mode compress --alphabet alphabets/ab.txt --minW 3 --maxW 4"
 
 run_test "Single character input" "pass" \
-    "echo -n 'a' | java LZWTool --mode compress --alphabet alphabets/ab.txt --minW 3 --maxW 4 | java LZWTool --mode expand > /tmp/single.out && cmp -s <(echo -n 'a') /tmp/single.out"
+    "cmp -s <(echo -n 'a') <(echo -n 'a' | java LZWTool --mode compress --alphabet alphabets/ab.txt --minW 3 --maxW 4 | java LZWTool --mode expand)"
 
 # 6. Corrupted compressed data
 run_test "Corrupt compressed file (random bytes)" "fail" \
-    "head -c 50 /dev/urandom | java LZWTool --mode expand"
+    "seeded_random_bytes 50 | java LZWTool --mode expand"
 
 run_test "Truncated compressed file" "fail" \
     "echo 'aaabbb' | java LZWTool --mode compress --alphabet alphabets/ab.txt --minW 3 --maxW 4 | head -c 10 | java LZWTool --mode expand"
@@ -112,7 +123,7 @@ run_test "Null bytes in input (if in alphabet)" "fail" \
     "printf 'a\x00b' | java LZWTool --mode compress --alphabet alphabets/ab.txt --minW 3 --maxW 4"
 
 run_test "Newlines and special chars (should work with ascii.txt)" "pass" \
-    "printf 'hello\nworld\ttab\rcarriage' | java LZWTool --mode compress --alphabet alphabets/ascii.txt --minW 9 --maxW 16 | java LZWTool --mode expand > /tmp/special.out && cmp -s <(printf 'hello\nworld\ttab\rcarriage') /tmp/special.out"
+    "cmp -s <(printf 'hello\nworld\ttab\rcarriage') <(printf 'hello\nworld\ttab\rcarriage' | java LZWTool --mode compress --alphabet alphabets/ascii.txt --minW 9 --maxW 16 | java LZWTool --mode expand)"
 
 # 9. Policy-specific tests
 run_test "Invalid policy name" "pass" \
@@ -122,14 +133,111 @@ run_test "Invalid policy name" "pass" \
 run_test "Very long input (100KB of 'a's)" "pass" \
     "head -c 100000 /dev/zero | tr '\0' 'a' | java LZWTool --mode compress --alphabet alphabets/ab.txt --minW 3 --maxW 16 | java LZWTool --mode expand | wc -c | grep -q 100000"
 
+# 11. Batch mode: a bad job gets an ERR reply and the JVM moves on to the next
+# Run a --batch manifest, then check its exit status and that it printed one
+# reply per pattern (extended regex, in order)
+check_batch() {
+    local manifest="$1"
+    local expected_status="$2"
+    shift 2
+    local status reply replies=() pattern i=0
+
+    java LZWTool --batch "$manifest" > "$manifest.replies" 2>/dev/null
+    status=$?
+    if [ $status -ne "$expected_status" ]; then
+        echo "exit status $status, expected $expected_status" >&2
+        return 1
+    fi
+
+    # A read loop rather than mapfile, which bash 3.2 (macOS) doesn't have
+    while IFS= read -r reply; do
+        replies+=("$reply")
+    done < "$manifest.replies"
+    if [ ${#replies[@]} -ne $# ]; then
+        echo "got ${#replies[@]} replies, expected $#" >&2
+        return 1
+    fi
+    for pattern in "$@"; do
+        if ! [[ "${replies[i]}" =~ ^$pattern$ ]]; then
+            echo "reply $((i + 1)): '${replies[i]}' does not match '$pattern'" >&2
+            return 1
+        fi
+        i=$((i + 1))
+    done
+}
+
+printf 'abab' > "$WORK_DIR/good.txt"
+printf 'abc' > "$WORK_DIR/bad.txt"
+seeded_random_bytes 50 > "$WORK_DIR/corrupt.lzw"
+GOOD_JOB=$(printf 'compress\t%s\t%s\t3\t4\tfreeze\talphabets/ab.txt' "$WORK_DIR/good.txt" "$WORK_DIR/good.lzw")
+
+printf '# comment\n\n%s\nexpand\t%s\t%s\n' "$GOOD_JOB" "$WORK_DIR/good.lzw" "$WORK_DIR/good.out" > "$WORK_DIR/ok.jobs"
+run_test "Batch: all jobs succeed (exit 0, comments and blank lines skipped)" "pass" \
+    "check_batch '$WORK_DIR/ok.jobs' 0 'OK [0-9]+' 'OK 4' && cmp -s '$WORK_DIR/good.txt' '$WORK_DIR/good.out'"
+
+printf 'compress\t%s\t%s\t3\t4\tfreeze\talphabets/ab.txt\n%s\n' "$WORK_DIR/bad.txt" "$WORK_DIR/bad.lzw" "$GOOD_JOB" > "$WORK_DIR/reject.jobs"
+run_test "Batch: out-of-alphabet input fails its job only (exit 1)" "pass" \
+    "check_batch '$WORK_DIR/reject.jobs' 1 'ERR: .*not in the alphabet' 'OK [0-9]+'"
+
+printf 'expand\t%s\t%s\n%s\n' "$WORK_DIR/corrupt.lzw" "$WORK_DIR/corrupt.out" "$GOOD_JOB" > "$WORK_DIR/corrupt.jobs"
+run_test "Batch: corrupt compressed input fails its job only (exit 1)" "pass" \
+    "check_batch '$WORK_DIR/corrupt.jobs' 1 'ERR: .*' 'OK [0-9]+'"
+
+printf 'compress\t%s\n%s\n' "$WORK_DIR/good.txt" "$GOOD_JOB" > "$WORK_DIR/malformed.jobs"
+run_test "Batch: malformed job line (exit 1)" "pass" \
+    "check_batch '$WORK_DIR/malformed.jobs' 1 'ERR: Malformed job.*' 'OK [0-9]+'"
+
+printf 'compress\t%s\t%s\tabc\t4\tfreeze\talphabets/ab.txt\ncompress\t%s\t%s\t5\t3\tfreeze\talphabets/ab.txt\n%s\n' \
+    "$WORK_DIR/good.txt" "$WORK_DIR/w1.lzw" "$WORK_DIR/good.txt" "$WORK_DIR/w2.lzw" "$GOOD_JOB" > "$WORK_DIR/widths.jobs"
+run_test "Batch: non-numeric and minW > maxW widths (exit 1)" "pass" \
+    "check_batch '$WORK_DIR/widths.jobs' 1 'ERR: Invalid width.*' 'ERR: Invalid widths.*' 'OK [0-9]+'"
+
+printf 'compress\t%s\t%s\t3\t4\tfreeze\t/nonexistent/file.txt\n%s\n' "$WORK_DIR/good.txt" "$WORK_DIR/na.lzw" "$GOOD_JOB" > "$WORK_DIR/alphabet.jobs"
+run_test "Batch: missing alphabet file (exit 1)" "pass" \
+    "check_batch '$WORK_DIR/alphabet.jobs' 1 'ERR: Failed to load alphabet.*' 'OK [0-9]+'"
+
+# Header: minW=9, maxW=30, policy=0, 2-symbol alphabet "ab"
+printf '\x09\x1e\x00\x00\x02ab' > "$WORK_DIR/wide.lzw"
+printf 'expand\t%s\t%s\ncompress\t%s\t%s\t9\t30\tfreeze\talphabets/ab.txt\n%s\n' \
+    "$WORK_DIR/wide.lzw" "$WORK_DIR/wide.out" "$WORK_DIR/good.txt" "$WORK_DIR/wide2.lzw" "$GOOD_JOB" > "$WORK_DIR/wide.jobs"
+run_test "Batch: maxW=30 in a header or a job is refused, not allocated (exit 1)" "pass" \
+    "check_batch '$WORK_DIR/wide.jobs' 1 'ERR: Corrupt header.*' 'ERR: Invalid widths.*' 'OK [0-9]+'"
+
+run_test "Batch: --batch without a manifest path" "fail" \
+    "java LZWTool --batch"
+
+run_test "Batch: non-existent manifest" "fail" \
+    "java LZWTool --batch /nonexistent/jobs.txt"
+
+# 12. Server mode: an alphabet rewritten between jobs must be reloaded, not served from cache
+check_alphabet_reload() {
+    local server_dir="$WORK_DIR/server"
+    local first second
+
+    mkdir "$server_dir"
+    printf 'a\nb' > "$server_dir/alphabet.txt"
+    lzw_server_start "$server_dir"
+    lzw_server_run compress "$WORK_DIR/good.txt" "$server_dir/1.lzw" 3 4 freeze "$server_dir/alphabet.txt"
+    first="$LZW_REPLY"
+    printf 'a' > "$server_dir/alphabet.txt"
+    lzw_server_run compress "$WORK_DIR/good.txt" "$server_dir/2.lzw" 3 4 freeze "$server_dir/alphabet.txt"
+    second="$LZW_REPLY"
+    lzw_server_stop
+
+    if [[ "$first" != "OK "* || "$second" != "ERR: "*"not in the alphabet"* ]]; then
+        echo "replies: '$first', '$second'" >&2
+        return 1
+    fi
+}
+
+run_test "Server: rewritten alphabet file is reloaded" "pass" \
+    "check_alphabet_reload"
+
 # Summary
 echo -e "${BLUE}=====================================${NC}"
 echo -e "${BLUE}Summary: $pass_count/$test_count tests passed${NC}"
 echo -e "${BLUE}=====================================${NC}"
 
-# Cleanup
-rm -f /tmp/test_out.txt /tmp/empty_alphabet.txt /tmp/empty.lzw /tmp/single.out /tmp/special.out
-
 if [ $pass_count -eq $test_count ]; then
     echo -e "${GREEN}All tests passed!${NC}"
     exit 0
@@ -2,6 +2,8 @@
 
 # Test LZWTool with real files using ASCII alphabet
 
+source "$(dirname "$0")/lzw_common.sh"
+
 GREEN='\033[0;32m'
 RED='\033[0;31m'
 BLUE='\033[0;34m'
@@ -12,23 +14,23 @@ echo -e "${BLUE}=====================================${NC}"
 echo -e "${BLUE}Testing LZWTool with Real Files${NC}"
 echo -e "${BLUE}=====================================${NC}\n"
 
-# Compile
+# Compile (skipped if the class files are up to date)
 echo -e "${BLUE}Compiling...${NC}"
-javac LZWTool.java BinaryStdIn.java BinaryStdOut.java TSTmod.java 2>&1
+ensure_compiled 2>&1
 if [ $? -ne 0 ]; then
     echo -e "${RED}Compilation failed!${NC}"
     exit 1
 fi
 echo -e "${GREEN}✓ Compilation successful${NC}\n"
 
-# Test files
+# Test files (ascii.txt covers all 256 byte values, so every one must round-trip)
 FILES=(
     "TestFiles/code.txt:text file"
     "TestFiles/medium.txt:medium text"
     "TestFiles/all.tar:tar archive"
     "TestFiles/wacky.bmp:bitmap image"
     "TestFiles/gone_fishing.bmp:small bitmap"
-    "TestFiles/frosty.jpg:JPEG (should fail with ASCII)"
+    "TestFiles/frosty.jpg:JPEG image"
 )
 
 POLICIES=("freeze" "reset" "lru" "lfu")
@@ -36,56 +38,100 @@ POLICIES=("freeze" "reset" "lru" "lfu")
 echo -e "${BLUE}Testing with ASCII alphabet (alphabets/ascii.txt)${NC}"
 echo -e "${BLUE}=====================================${NC}\n"
 
+# Files are independent, so test them concurrently (one worker per core).
+# Each worker keeps one LZWTool --server JVM for all of its policies, and
+# each (file, policy) pair gets its own directory so runs never share files.
+RESULTS_DIR=$(mktemp -d)
+trap 'rm -rf "$RESULTS_DIR"' EXIT
+
+test_policy() {
+    local filepath="$1"
+    local filesize="$2"
+    local policy="$3"
+    local task_dir="$4"
+
+    lzw_roundtrip "$filepath" alphabets/ascii.txt 9 16 "$policy" "$task_dir/test"
+    reply="$LZW_REPLY"
+
+    case "$reply" in
+        OK*)
+            # The server reports how many bytes it wrote, so no need to stat the output
+            compressed_size="${reply#OK }"
+            ratio=$(echo "scale=4; $compressed_size / $filesize" | bc)
+            echo -e "  ${GREEN}✓ $policy: ${compressed_size} bytes (ratio: $ratio)${NC}"
+            ;;
+        "ERR: compress: "*)
+            echo -e "  ${RED}$policy: Compression failed - ${reply#ERR: compress: }${NC}"
+            touch "$task_dir/fail"
+            ;;
+        "ERR: expand: "*)
+            echo -e "  ${RED}$policy: Decompression failed${NC}"
+            touch "$task_dir/fail"
+            ;;
+        *)
+            echo -e "  ${RED}✗ $policy: Output doesn't match input!${NC}"
+            touch "$task_dir/fail"
+            ;;
+    esac
+}
+
+# Run every policy for one file through a single server JVM
+test_file() {
+    local filepath="$1"
+    local filesize="$2"
+    local file_dir="$3"
+    local policy
+
+    lzw_server_start "$file_dir"
+    for policy in "${POLICIES[@]}"; do
+        mkdir "$file_dir/$policy"
+        test_policy "$filepath" "$filesize" "$policy" "$file_dir/$policy" > "$file_dir/$policy/log"
+    done
+    lzw_server_stop
+}
+
+# Launch one worker per file
 for file_desc in "${FILES[@]}"; do
     IFS=':' read -r filepath description <<< "$file_desc"
 
     if [ ! -f "$filepath" ]; then
-        echo -e "${YELLOW}⊘ Skipping $description - file not found${NC}"
         continue
     fi
 
     filename=$(basename "$filepath")
     filesize=$(stat -f%z "$filepath" 2>/dev/null || stat -c%s "$filepath" 2>/dev/null)
+    mkdir "$RESULTS_DIR/$filename"
+    echo -e "${BLUE}Testing: $description ($filename) - ${filesize} bytes${NC}" > "$RESULTS_DIR/$filename/header"
 
-    echo -e "${BLUE}Testing: $description ($filename) - ${filesize} bytes${NC}"
-
-    for policy in "${POLICIES[@]}"; do
-        # Compress
-        cat "$filepath" | java LZWTool --mode compress --alphabet alphabets/ascii.txt \
-            --minW 9 --maxW 16 --policy "$policy" > /tmp/test.lzw 2>/tmp/error.txt
-
-        if [ $? -ne 0 ]; then
-            error_msg=$(cat /tmp/error.txt)
-            if [[ "$error_msg" == *"not in the alphabet"* ]]; then
-                echo -e "  ${YELLOW}$policy: Correctly rejected - contains non-ASCII bytes${NC}"
-            else
-                echo -e "  ${RED}$policy: Compression failed - $error_msg${NC}"
-            fi
-            continue
-        fi
-
-        compressed_size=$(stat -f%z /tmp/test.lzw 2>/dev/null || stat -c%s /tmp/test.lzw 2>/dev/null)
+    throttle
+    test_file "$filepath" "$filesize" "$RESULTS_DIR/$filename" &
+done
+wait
 
-        # Expand
-        cat /tmp/test.lzw | java LZWTool --mode expand > /tmp/test.out 2>/tmp/error.txt
+# Report in file order once all pairs are done
+failures=0
+for file_desc in "${FILES[@]}"; do
+    IFS=':' read -r filepath description <<< "$file_desc"
 
-        if [ $? -ne 0 ]; then
-            echo -e "  ${RED}$policy: Decompression failed${NC}"
-            continue
-        fi
+    filename=$(basename "$filepath")
+    if [ ! -d "$RESULTS_DIR/$filename" ]; then
+        echo -e "${YELLOW}⊘ Skipping $description - file not found${NC}"
+        continue
+    fi
 
-        # Compare
-        if cmp -s "$filepath" /tmp/test.out; then
-            ratio=$(echo "scale=4; $compressed_size / $filesize" | bc)
-            echo -e "  ${GREEN}✓ $policy: ${compressed_size} bytes (ratio: $ratio)${NC}"
-        else
-            echo -e "  ${RED}✗ $policy: Output doesn't match input!${NC}"
+    cat "$RESULTS_DIR/$filename/header"
+    for policy in "${POLICIES[@]}"; do
+        cat "$RESULTS_DIR/$filename/$policy/log"
+        if [ -f "$RESULTS_DIR/$filename/$policy/fail" ]; then
+            failures=$((failures + 1))
         fi
     done
     echo ""
 done
 
-# Cleanup
-rm -f /tmp/test.lzw /tmp/test.out /tmp/error.txt
+if [ $failures -ne 0 ]; then
+    echo -e "${RED}$failures round-trip(s) failed!${NC}"
+    exit 1
+fi
 
 echo -e "${GREEN}Done!${NC}"
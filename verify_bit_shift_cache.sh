@@ -2,11 +2,16 @@
 
 # Prove that cached bit-shift operations produce identical results
 
+source "$(dirname "$0")/lzw_common.sh"
+
 echo "=== Proving Cached Bit-Shift Optimization is Correct ==="
 echo ""
 
+WORK_DIR=$(mktemp -d)
+trap 'rm -rf "$WORK_DIR"' EXIT
+
 # Create test with detailed debug output
-cat > TestBitShift.java <<'EOF'
+cat > "$WORK_DIR/TestBitShift.java" <<'EOF'
 public class TestBitShift {
     public static void main(String[] args) {
         System.out.println("Simulating LZW compression loop...\n");
@@ -86,25 +91,27 @@ public class TestBitShift {
 }
 EOF
 
-javac TestBitShift.java
-java TestBitShift
-rm -f TestBitShift.java TestBitShift.class
+javac -d "$WORK_DIR" "$WORK_DIR/TestBitShift.java"
+java -cp "$WORK_DIR" TestBitShift
 
 echo ""
 echo "=== Testing with actual LZWTool ==="
 echo "Compressing a test file with ab.txt (minW=3, maxW=10)..."
 
-# Create test file
-echo "aaaabbbbaaaabbbb" > /tmp/test_input.txt
+if ! ensure_compiled; then
+    echo "✗ Compilation failed"
+    exit 1
+fi
 
-# Compress and decompress
-cat /tmp/test_input.txt | java LZWTool --mode compress --alphabet alphabets/ab.txt \
-    --minW 3 --maxW 10 --policy freeze > /tmp/test.lzw 2>/dev/null
+echo "aaaabbbbaaaabbbb" > "$WORK_DIR/test_input.txt"
 
-cat /tmp/test.lzw | java LZWTool --mode expand > /tmp/test_output.txt 2>/dev/null
+# Compress, decompress and verify on one server JVM
+lzw_server_start "$WORK_DIR"
+lzw_roundtrip "$WORK_DIR/test_input.txt" alphabets/ab.txt 3 10 freeze "$WORK_DIR/test"
+roundtrip_status=$?
+lzw_server_stop
 
-# Verify
-if cmp -s /tmp/test_input.txt /tmp/test_output.txt; then
+if [ $roundtrip_status -eq 0 ]; then
     echo "✓ LZWTool compress/decompress cycle successful"
     echo "✓ Cached bit-shift optimization works correctly!"
 else
@@ -112,9 +119,6 @@ else
     exit 1
 fi
 
-# Cleanup
-rm -f /tmp/test_input.txt /tmp/test.lzw /tmp/test_output.txt
-
 echo ""
 echo "=== CONCLUSION ==="
 echo "The cached bit-shift optimization is MATHEMATICALLY IDENTICAL to the original"